@@ -3,7 +3,7 @@ import pandas as pd
 import streamlit as st
 from utils import ensure_dirs
 from db import init_schema, get_engine
-from model_train import train_model, MODEL_PATH, SCALER_PATH
+from model_train import train_model, prepare_features, score_and_explain, MODEL_PATH, SCALER_PATH
 from ingest_docs import ingest_folder
 from chains import summarize_applicant, answer_query, recommend
 from rag import RAGStore
@@ -73,7 +73,8 @@ with tab3:
             with open(MODEL_PATH, "rb") as f:
                 model_data = pickle.load(f)
             # Support both old and new formats
-            if isinstance(model_data, dict) and all(k in model_data for k in ["model", "scaler", "feature_names"]):
+            is_bundle = isinstance(model_data, dict) and all(k in model_data for k in ["model", "scaler", "feature_names"])
+            if is_bundle:
                 model = model_data["model"]
                 scaler = model_data["scaler"]
                 feature_names = model_data.get("feature_names", [])
@@ -84,30 +85,26 @@ with tab3:
                     scaler = pickle.load(f)
                 feature_names = []
             if app_features:
-                # Preprocess features the same way as in training
-                feature_df = row.drop(columns=["approved", "applicant_id", "name"])
-                
-                # Handle categorical variables by one-hot encoding
-                categorical_columns = feature_df.select_dtypes(include=['object']).columns
-                if len(categorical_columns) > 0:
-                    # One-hot encode categorical variables
-                    feature_df = pd.get_dummies(feature_df, columns=categorical_columns, drop_first=True)
-                
-                # Ensure columns align with training-time feature order
-                try:
-                    if 'feature_names' in locals() and feature_names:
-                        feature_df = feature_df.reindex(columns=feature_names, fill_value=0)
-                except Exception:
-                    pass
-                
-                X = feature_df.values
-                Xs = scaler.transform(X)
-                try:
-                    proba = model.predict_proba(Xs)[:,1][0]
-                except Exception:
-                    proba = float(model.decision_function(Xs)[0])
-                    proba = 1/(1+pow(2.71828,-proba))
+                contribs = None
+                if is_bundle:
+                    # Score and explain in one pass; contributions are log-odds of approval
+                    approval, explanations = score_and_explain(model_data, row)
+                    approval = float(approval[0])
+                    contribs = -explanations.iloc[0].drop("bias")
+                else:
+                    Xs = scaler.transform(prepare_features(row, feature_names).values)
+                    try:
+                        approval = model.predict_proba(Xs)[:,1][0]
+                    except Exception:
+                        approval = float(model.decision_function(Xs)[0])
+                        approval = 1/(1+pow(2.71828,-approval))
+                # The model predicts approval, so risk is its complement
+                proba = 1 - approval
                 st.info(f"Estimated risk score (higher= riskier): {proba:.3f}")
+                if contribs is not None:
+                    top = contribs.reindex(contribs.abs().sort_values(ascending=False).index).head(5)
+                    st.caption("Top feature contributions to risk (log-odds; positive = riskier):")
+                    st.dataframe(top.rename("contribution"))
                 if st.button("Recommend Action"):
                     st.code(recommend(app_features, float(proba)), language="json")
         else:
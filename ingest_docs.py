@@ -1,5 +1,6 @@
-import os, re
-from typing import List, Dict
+import os, re, time
+from typing import List, Dict, Tuple
+from tqdm import tqdm
 from pypdf import PdfReader
 from db import get_engine
 from rag import RAGStore
@@ -25,31 +26,125 @@ def chunk_text(text: str, size=CHUNK_SIZE, overlap=CHUNK_OVERLAP) -> List[str]:
         i += (size - overlap)
     return chunks
 
-def ingest_folder(applicant_id: str, folder: str):
-    eng = get_engine()
-    chunks_for_index = []
-    for name in os.listdir(folder):
-        path = os.path.join(folder, name)
-        if not os.path.isfile(path): continue
+def _doc_files(folder: str) -> List[str]:
+    names = []
+    for name in sorted(os.listdir(folder)):
+        if not os.path.isfile(os.path.join(folder, name)): continue
         if not any(name.lower().endswith(ext) for ext in [".pdf", ".txt"]): continue
-        text = read_file_text(path)
-        # Save full doc to DB
-        with eng.begin() as conn:
-            conn.exec_driver_sql(
-                "INSERT INTO documents(applicant_id, doc_name, doc_path, doc_text) VALUES (:a,:n,:p,:t)",
-                {"a": applicant_id, "n": name, "p": path, "t": text[:200000]}
-            )
-        # Create chunks for index
-        for ch in chunk_text(text):
-            chunks_for_index.append({"doc_name": name, "text": ch})
+        names.append(name)
+    return names
+
+def folder_fingerprint(folder: str) -> List[list]:
+    """(name, size, mtime) of each ingestible file; changes when documents are added or edited."""
+    out = []
+    for name in _doc_files(folder):
+        st = os.stat(os.path.join(folder, name))
+        out.append([name, st.st_size, st.st_mtime_ns])
+    return out
+
+def read_folder(folder: str) -> List[Dict]:
+    docs = []
+    for name in _doc_files(folder):
+        path = os.path.join(folder, name)
+        docs.append({"name": name, "path": path, "text": read_file_text(path)})
+    return docs
+
+def save_documents(conn, applicant_id: str, docs: List[Dict]):
+    """Replace an applicant's documents rows (so re-ingesting doesn't duplicate them)."""
+    conn.exec_driver_sql("DELETE FROM documents WHERE applicant_id = :a", {"a": applicant_id})
+    if docs:
+        conn.exec_driver_sql(
+            "INSERT INTO documents(applicant_id, doc_name, doc_path, doc_text) VALUES (:a,:n,:p,:t)",
+            [{"a": applicant_id, "n": d["name"], "p": d["path"], "t": d["text"][:200000]} for d in docs]
+        )
+
+def chunk_docs(docs: List[Dict]) -> List[Dict]:
+    return [{"doc_name": d["name"], "text": ch} for d in docs for ch in chunk_text(d["text"])]
+
+def ingest_folder(applicant_id: str, folder: str):
+    fingerprint = folder_fingerprint(folder)
+    docs = read_folder(folder)
+    with get_engine().begin() as conn:
+        save_documents(conn, applicant_id, docs)
     # Build RAG index
-    RAGStore().build(applicant_id, chunks_for_index)
+    RAGStore().build(applicant_id, chunk_docs(docs), fingerprint)
+
+def ingest_root(root: str, batch_size: int = 256, workers: int = 1, group_size: int = 200,
+                overwrite: bool = False) -> Dict[str, float]:
+    """Ingest every applicant folder under root (e.g. data/sample_docs/<id>/).
+
+    Applicants are processed in groups of group_size: their documents are saved
+    in one transaction, their chunks are embedded together in large batches and
+    split back into per-applicant indexes before the next group is read. Each
+    index records a fingerprint of its folder, and applicants whose folder is
+    unchanged are skipped unless overwrite is set, so an interrupted run can
+    simply be restarted. Returns throughput stats.
+    """
+    eng = get_engine()
+    store = RAGStore()
+    t0 = time.perf_counter()
+    fingerprints = {}
+    skipped = 0
+    for a in sorted(os.listdir(root)):
+        folder = os.path.join(root, a)
+        if not os.path.isdir(folder): continue
+        fp = folder_fingerprint(folder)
+        if not overwrite and store.index_fingerprint(a) == fp:
+            skipped += 1
+            continue
+        fingerprints[a] = fp
+    pending = list(fingerprints)
+    n_docs = n_chunks = n_empty = 0
+    pool = store.start_pool(workers) if workers > 1 and pending else None
+    try:
+        with tqdm(total=len(pending), desc="Ingesting applicants") as bar:
+            for i in range(0, len(pending), group_size):
+                group = pending[i:i + group_size]
+                docs_by_applicant = {a: read_folder(os.path.join(root, a)) for a in group}
+                with eng.begin() as conn:
+                    for applicant_id, docs in docs_by_applicant.items():
+                        save_documents(conn, applicant_id, docs)
+                chunks_by_applicant = {a: chunk_docs(docs) for a, docs in docs_by_applicant.items()}
+                n_docs += sum(len(d) for d in docs_by_applicant.values())
+                n_chunks += sum(len(c) for c in chunks_by_applicant.values())
+                n_empty += sum(1 for c in chunks_by_applicant.values() if not c)
+                store.build_many(chunks_by_applicant, batch_size=batch_size, pool=pool,
+                                 fingerprints={a: fingerprints[a] for a in group})
+                bar.update(len(group))
+    finally:
+        if pool is not None:
+            store.stop_pool(pool)
+    elapsed = max(time.perf_counter() - t0, 1e-9)
+    return {
+        "applicants": len(pending) - n_empty,
+        "empty": n_empty,
+        "skipped": skipped,
+        "docs": n_docs,
+        "chunks": n_chunks,
+        "seconds": elapsed,
+        "docs_per_sec": n_docs / elapsed,
+        "chunks_per_sec": n_chunks / elapsed,
+    }
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
-    parser.add_argument("--applicant_id", required=True)
-    parser.add_argument("--folder", required=True)
+    parser.add_argument("--applicant_id")
+    parser.add_argument("--folder")
+    parser.add_argument("--root", help="Directory of per-applicant folders for bulk ingestion")
+    parser.add_argument("--batch_size", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=1, help="Encoding processes (each loads its own model)")
+    parser.add_argument("--group_size", type=int, default=200, help="Applicants per read/encode/write group")
+    parser.add_argument("--overwrite", action="store_true", help="Re-ingest applicants even if their folder is unchanged")
     args = parser.parse_args()
-    ingest_folder(args.applicant_id, args.folder)
+    if args.root:
+        stats = ingest_root(args.root, batch_size=args.batch_size, workers=args.workers,
+                            group_size=args.group_size, overwrite=args.overwrite)
+        print(f"Ingested {stats['docs']} docs / {stats['chunks']} chunks for {stats['applicants']} applicants "
+              f"({stats['empty']} with no text, {stats['skipped']} unchanged and skipped) "
+              f"in {stats['seconds']:.1f}s ({stats['docs_per_sec']:.1f} docs/sec, {stats['chunks_per_sec']:.1f} chunks/sec)")
+    elif args.applicant_id and args.folder:
+        ingest_folder(args.applicant_id, args.folder)
+    else:
+        parser.error("either --root or both --applicant_id and --folder are required")
     print("Ingestion complete.")
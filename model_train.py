@@ -18,14 +18,8 @@ def train_model(csv_path: str = "data/applications_sample.csv"):
     # We'll define the label as 'approved' (1/0) in the sample
     y = df["approved"].astype(int).values
     
-    # Drop non-feature columns
-    feature_df = df.drop(columns=["approved", "applicant_id", "name"])
-    
-    # Handle categorical variables by one-hot encoding
-    categorical_columns = feature_df.select_dtypes(include=['object']).columns
-    if len(categorical_columns) > 0:
-        # One-hot encode categorical variables
-        feature_df = pd.get_dummies(feature_df, columns=categorical_columns, drop_first=True)
+    # Drop non-feature columns and one-hot encode categoricals
+    feature_df, raw_columns, feature_groups = encode_features(df, drop_first=True)
     
     # Convert to numpy array
     X = feature_df.values
@@ -60,7 +54,9 @@ def train_model(csv_path: str = "data/applications_sample.csv"):
     model_data = {
         'model': model,
         'scaler': scaler,
-        'feature_names': feature_names
+        'feature_names': feature_names,
+        'raw_feature_names': raw_columns,
+        'feature_groups': feature_groups
     }
     
     with open(MODEL_PATH, "wb") as f: 
@@ -71,5 +67,78 @@ def train_model(csv_path: str = "data/applications_sample.csv"):
     print(f"Model trained with {len(feature_names)} features: {feature_names}")
     return auc
 
+def encode_features(df: pd.DataFrame, drop_first: bool = False):
+    """Drop non-feature columns and one-hot encode categoricals.
+
+    Returns (encoded frame, original column names, {encoded column: original column}).
+    """
+    feature_df = df.drop(columns=["approved", "applicant_id", "name"], errors="ignore")
+    raw_columns = feature_df.columns.tolist()
+    categorical_columns = feature_df.select_dtypes(include=['object']).columns
+    numeric_df = feature_df.drop(columns=categorical_columns)
+    feature_groups = {c: c for c in numeric_df.columns}
+    parts = [numeric_df]
+    for c in categorical_columns:
+        dummies = pd.get_dummies(feature_df[c], prefix=c, drop_first=drop_first)
+        feature_groups.update({d: c for d in dummies.columns})
+        parts.append(dummies)
+    return pd.concat(parts, axis=1), raw_columns, feature_groups
+
+def prepare_features(df: pd.DataFrame, feature_names=None) -> pd.DataFrame:
+    """Encode a scoring batch and align it to the training-time columns.
+
+    Every level is encoded here; reindexing to feature_names drops the level
+    training dropped, so the result doesn't depend on which levels the batch has.
+    """
+    feature_df, _, _ = encode_features(df)
+    if feature_names:
+        feature_df = feature_df.reindex(columns=feature_names, fill_value=0)
+    return feature_df
+
+def _legacy_groups(df: pd.DataFrame, feature_names) -> dict:
+    """Recover {encoded column: original column} for artifacts saved without feature_groups."""
+    _, raw_columns, batch_groups = encode_features(df)
+    categorical = sorted((c for c in raw_columns if c not in feature_names), key=len, reverse=True)
+    groups = {}
+    for f in feature_names:
+        # Levels missing from this batch fall back to the longest matching categorical prefix
+        groups[f] = batch_groups.get(f) or next((c for c in categorical if f.startswith(f"{c}_")), f)
+    return groups
+
+def score_and_explain(model_data: dict, df: pd.DataFrame):
+    """Score a batch of applicants and explain each score in the same pass.
+
+    Returns (P(approved) per row, DataFrame of per-feature contributions to the
+    log-odds of approval plus a 'bias' column). XGBoost uses native tree
+    contributions (pred_contribs); LogisticRegression uses coefficient x scaled
+    value, which is exact for a linear model. One-hot columns are summed back
+    into their original feature, and each row plus 'bias' sums to the log-odds.
+    """
+    model, scaler = model_data["model"], model_data["scaler"]
+    feature_names = model_data.get("feature_names", [])
+    feature_df = prepare_features(df, feature_names)
+    Xs = scaler.transform(feature_df.values.astype(float))
+
+    if hasattr(model, "get_booster"):
+        from xgboost import DMatrix
+        contribs = model.get_booster().predict(DMatrix(Xs), pred_contribs=True)
+        values, bias = contribs[:, :-1], contribs[:, -1]
+    else:
+        values = Xs * model.coef_[0]
+        bias = np.full(len(Xs), model.intercept_[0])
+    proba = 1 / (1 + np.exp(-(values.sum(axis=1) + bias)))
+
+    # Sum one-hot columns into their original feature with a 0/1 indicator matrix
+    groups = model_data.get("feature_groups") or _legacy_groups(df, feature_df.columns)
+    raw = list(model_data.get("raw_feature_names") or [])
+    raw += [g for g in dict.fromkeys(groups.get(c, c) for c in feature_df.columns) if g not in raw]
+    pos = {name: j for j, name in enumerate(raw)}
+    G = np.zeros((len(feature_df.columns), len(raw)))
+    for i, c in enumerate(feature_df.columns):
+        G[i, pos[groups.get(c, c)]] = 1.0
+    out = pd.DataFrame(values @ G, columns=raw, index=df.index)
+    out["bias"] = bias
+    return proba, out
+
 if __name__ == "__main__":
     train_model()
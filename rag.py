@@ -21,22 +21,79 @@ class RAGStore:
         return (os.path.join(self.base_dir, f"{applicant_id}.faiss"),
                 os.path.join(self.base_dir, f"{applicant_id}.json"))
 
-    def build(self, applicant_id: str, chunks: List[Dict]):
+    def build(self, applicant_id: str, chunks: List[Dict], fingerprint=None):
+        texts = [c["text"] for c in chunks]
+        embs = self.model.encode(texts, normalize_embeddings=True) if texts else None
+        self._write_index(applicant_id, chunks, embs, fingerprint)
+
+    def index_fingerprint(self, applicant_id: str):
+        """Fingerprint stored with an applicant's index, or None if there is no complete index."""
+        json_path = self._index_paths(applicant_id)[1]
+        # The JSON sidecar is written last, so its presence means the index is complete
+        if not os.path.exists(json_path):
+            return None
+        with open(json_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("fingerprint")
+
+    def start_pool(self, workers: int):
+        """Start a multi-process CPU encoding pool, splitting torch threads across workers."""
+        threads = str(max(1, (os.cpu_count() or 1) // workers))
+        saved = {k: os.environ.get(k) for k in ("OMP_NUM_THREADS", "MKL_NUM_THREADS")}
+        os.environ.update({k: threads for k in saved})
+        try:
+            return self.model.start_multi_process_pool(target_devices=["cpu"] * workers)
+        finally:
+            for k, v in saved.items():
+                if v is None: os.environ.pop(k, None)
+                else: os.environ[k] = v
+
+    def stop_pool(self, pool):
+        self.model.stop_multi_process_pool(pool)
+
+    def build_many(self, chunks_by_applicant: Dict[str, List[Dict]], batch_size: int = 256, pool=None, fingerprints=None):
+        """Embed chunks for many applicants in one pass, then write one index per applicant.
+
+        All texts are concatenated into a single encode call (on the given
+        multi-process pool, if any) and the vectors are split back by each
+        applicant's chunk count. Applicants with no chunks get an empty index.
+        """
+        fingerprints = fingerprints or {}
+        texts = [c["text"] for chunks in chunks_by_applicant.values() for c in chunks]
+        embs = None
+        if texts and pool is not None:
+            embs = self.model.encode_multi_process(texts, pool, batch_size=batch_size, normalize_embeddings=True)
+        elif texts:
+            embs = self.model.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+
+        start = 0
+        for applicant_id, chunks in chunks_by_applicant.items():
+            part = embs[start:start + len(chunks)] if chunks else None
+            self._write_index(applicant_id, chunks, part, fingerprints.get(applicant_id))
+            start += len(chunks)
+
+    def _write_index(self, applicant_id: str, chunks: List[Dict], embs, fingerprint=None):
         texts = [c["text"] for c in chunks]
         metas = [{"doc_name": c["doc_name"], "chunk_id": i} for i, c in enumerate(chunks)]
-        embs = self.model.encode(texts, normalize_embeddings=True)
         faiss_path, json_path = self._index_paths(applicant_id)
+        npy_path = faiss_path.replace(".faiss", ".npy")
 
-        if HAVE_FAISS:
+        if not chunks:
+            # Nothing to search; drop vectors left over from an earlier run
+            for path in (faiss_path, npy_path):
+                if os.path.exists(path): os.remove(path)
+        elif HAVE_FAISS:
             index = faiss.IndexFlatIP(embs.shape[1])
             index.add(embs.astype(np.float32))
             faiss.write_index(index, faiss_path)
         else:
             # Save embeddings for cosine search
-            np.save(faiss_path.replace(".faiss", ".npy"), embs.astype(np.float32))
+            np.save(npy_path, embs.astype(np.float32))
 
+        data = {"texts": texts, "metas": metas}
+        if fingerprint is not None:
+            data["fingerprint"] = fingerprint
         with open(json_path, "w", encoding="utf-8") as f:
-            json.dump({"texts": texts, "metas": metas}, f, ensure_ascii=False)
+            json.dump(data, f, ensure_ascii=False)
 
     def search(self, applicant_id: str, query: str, top_k: int = 5) -> List[Dict]:
         faiss_path, json_path = self._index_paths(applicant_id)
@@ -0,0 +1,70 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+from model_train import encode_features, prepare_features, score_and_explain
+
+CSV_PATH = "data/applications_sample.csv"
+
+
+def load_sample():
+    import os
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return pd.read_csv(os.path.join(root, CSV_PATH))
+
+
+def fit(df, model):
+    feature_df, raw_columns, feature_groups = encode_features(df, drop_first=True)
+    scaler = StandardScaler()
+    Xs = scaler.fit_transform(feature_df.values.astype(float))
+    model.fit(Xs, df["approved"].astype(int).values)
+    model_data = {
+        "model": model,
+        "scaler": scaler,
+        "feature_names": feature_df.columns.tolist(),
+        "raw_feature_names": raw_columns,
+        "feature_groups": feature_groups,
+    }
+    return model_data, Xs
+
+
+def test_single_row_matches_training_columns():
+    df = load_sample()
+    feature_df, _, _ = encode_features(df, drop_first=True)
+    for i in range(len(df)):
+        row = prepare_features(df.iloc[[i]], feature_df.columns.tolist())
+        assert row.columns.tolist() == feature_df.columns.tolist()
+        # The row's own category is set unless it is the level training dropped
+        np.testing.assert_array_equal(row.values.astype(float), feature_df.iloc[[i]].values.astype(float))
+
+
+def test_logistic_contributions_sum_to_decision_function():
+    df = load_sample()
+    model_data, Xs = fit(df, LogisticRegression(max_iter=200))
+    proba, contribs = score_and_explain(model_data, df)
+    assert contribs.columns.tolist() == model_data["raw_feature_names"] + ["bias"]
+    np.testing.assert_allclose(contribs.sum(axis=1), model_data["model"].decision_function(Xs), rtol=1e-6)
+    np.testing.assert_allclose(proba, model_data["model"].predict_proba(Xs)[:, 1], rtol=1e-6)
+
+
+def test_xgboost_contributions_sum_to_margin():
+    xgb = pytest.importorskip("xgboost")
+    df = load_sample()
+    model_data, Xs = fit(df, xgb.XGBClassifier(n_estimators=20, max_depth=2))
+    proba, contribs = score_and_explain(model_data, df)
+    margin = model_data["model"].predict(Xs, output_margin=True)
+    np.testing.assert_allclose(contribs.sum(axis=1), margin, rtol=1e-4, atol=1e-5)
+    np.testing.assert_allclose(proba, model_data["model"].predict_proba(Xs)[:, 1], rtol=1e-4, atol=1e-6)
+
+
+def test_legacy_artifact_groups_by_original_feature():
+    df = load_sample()
+    model_data, Xs = fit(df, LogisticRegression(max_iter=200))
+    legacy = {k: model_data[k] for k in ["model", "scaler", "feature_names"]}
+    _, contribs = score_and_explain(legacy, df.iloc[[0]])
+    _, expected = score_and_explain(model_data, df.iloc[[0]])
+    assert sorted(contribs.columns) == sorted(expected.columns)
+    np.testing.assert_allclose(contribs[expected.columns].values, expected.values)
@@ -0,0 +1,50 @@
+import json
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sentence_transformers")
+from rag import RAGStore
+
+
+class FakeModel:
+    """Maps each distinct text to its own unit vector, so search finds exact matches."""
+    def __init__(self, vocab):
+        self.vocab = {t: i for i, t in enumerate(vocab)}
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=True):
+        embs = np.zeros((len(texts), len(self.vocab)), dtype=np.float32)
+        for row, t in enumerate(texts):
+            embs[row, self.vocab[t]] = 1.0
+        return embs
+
+
+def make_store(tmp_path, vocab):
+    store = RAGStore.__new__(RAGStore)
+    store.base_dir = str(tmp_path)
+    store.model = FakeModel(vocab)
+    return store
+
+
+def test_build_many_splits_vectors_back_to_applicants(tmp_path):
+    chunks_by_applicant = {
+        "a": [{"doc_name": "a.txt", "text": "alpha one"}, {"doc_name": "a.txt", "text": "alpha two"}],
+        "b": [],
+        "c": [{"doc_name": "c.txt", "text": "gamma"}],
+    }
+    vocab = [c["text"] for chunks in chunks_by_applicant.values() for c in chunks]
+    store = make_store(tmp_path, vocab)
+    store.build_many(chunks_by_applicant, batch_size=2, fingerprints={"a": [["a.txt", 1, 1]]})
+
+    for applicant_id, chunks in chunks_by_applicant.items():
+        for c in chunks:
+            hits = store.search(applicant_id, c["text"], top_k=1)
+            assert hits[0]["text"] == c["text"]
+            assert hits[0]["score"] == pytest.approx(1.0)
+
+    # Empty applicants still get a (searchable, empty) index so resumed runs can skip them
+    assert store.search("b", "alpha one") == []
+    with open(tmp_path / "b.json", encoding="utf-8") as f:
+        assert json.load(f)["texts"] == []
+    assert store.index_fingerprint("a") == [["a.txt", 1, 1]]
+    assert store.index_fingerprint("c") is None
+    assert store.index_fingerprint("missing") is None